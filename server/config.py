@@ -1,5 +1,6 @@
 """Configuration loader for Tram Monitoring System."""
 
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -8,6 +9,10 @@ from pydantic_settings import BaseSettings
 
 from .models import ServerConfig, AlertConfig, TopicGroupsConfig
 
+# libyaml-backed C loader is ~10x faster than the pure-Python SafeLoader;
+# fall back gracefully when PyYAML is built without libyaml.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class Settings(BaseSettings):
     """Application settings."""
@@ -34,48 +39,76 @@ class Settings(BaseSettings):
 settings = Settings()
 
 
-def load_servers_config() -> list[ServerConfig]:
-    """Load servers configuration from YAML file."""
+# Config caches keyed by file mtime_ns: the files rarely change, so repeat
+# calls (every /api/servers request, every WS poll) become a dict lookup
+# instead of a stat + YAML parse + Pydantic re-validation.
+_servers_cache: Optional[tuple[int, tuple[ServerConfig, ...], dict[str, ServerConfig]]] = None
+_alerts_cache: Optional[tuple[int, AlertConfig]] = None
+
+
+def _file_mtime_ns(path: Path) -> int:
+    """Return st_mtime_ns of path, or -1 if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def load_servers_config() -> tuple[ServerConfig, ...]:
+    """Load servers configuration from YAML file (cached by mtime).
+
+    Returns an immutable tuple: the same cached object is shared across
+    callers, so nobody can mutate it out from under the cache.
+    """
+    global _servers_cache
     config_file = settings.config_dir / "config.yaml"
 
-    if not config_file.exists():
-        return [
+    mtime_ns = _file_mtime_ns(config_file)
+    if _servers_cache is not None and _servers_cache[0] == mtime_ns:
+        return _servers_cache[1]
+
+    if mtime_ns == -1:
+        servers = (
             ServerConfig(
                 id="local-agent",
                 name="Local Agent",
-            )
-        ]
-
-    with open(config_file) as f:
-        data = yaml.safe_load(f)
+            ),
+        )
+    else:
+        with open(config_file) as f:
+            data = yaml.load(f, Loader=_YAML_LOADER)
 
-    servers = []
-    for srv in data.get("servers", []):
-        servers.append(ServerConfig(**srv))
+        servers = tuple(ServerConfig(**srv) for srv in data.get("servers", []))
 
+    _servers_cache = (mtime_ns, servers, {s.id: s for s in servers})
     return servers
 
 
 def get_server_by_id(server_id: str) -> Optional[ServerConfig]:
-    """Get server config by ID."""
-    servers = load_servers_config()
-    for srv in servers:
-        if srv.id == server_id:
-            return srv
-    return None
+    """Get server config by ID (O(1) via the cached id index)."""
+    load_servers_config()  # refresh cache if config.yaml changed
+    return _servers_cache[2].get(server_id)
 
 
 def load_alert_config() -> AlertConfig:
-    """Load alert configuration from YAML file."""
+    """Load alert configuration from YAML file (cached by mtime)."""
+    global _alerts_cache
     # Сначала пробуем отдельный файл alerts.yaml
     alerts_file = settings.config_dir / "alerts.yaml"
-    if alerts_file.exists():
+
+    mtime_ns = _file_mtime_ns(alerts_file)
+    if _alerts_cache is not None and _alerts_cache[0] == mtime_ns:
+        return _alerts_cache[1]
+
+    config = AlertConfig()
+    if mtime_ns != -1:
         with open(alerts_file) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_YAML_LOADER)
             if data:
-                return AlertConfig(**data)
-    
-    return AlertConfig()
+                config = AlertConfig(**data)
+
+    _alerts_cache = (mtime_ns, config)
+    return config
 
 
 def load_topic_groups_config() -> TopicGroupsConfig:
@@ -83,7 +116,7 @@ def load_topic_groups_config() -> TopicGroupsConfig:
     config_file = settings.config_dir / "topic_groups.yaml"
     if config_file.exists():
         with open(config_file) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_YAML_LOADER)
             if data:
                 return TopicGroupsConfig(**data)
 
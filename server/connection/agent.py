@@ -10,14 +10,19 @@ import asyncio
 import json
 import logging
 import re
+import time
 from typing import TYPE_CHECKING, AsyncIterator, Optional
 
 if TYPE_CHECKING:
     from ..services.droppable_queue import DroppableQueue
 
 import websockets
+import yaml
 from websockets.client import WebSocketClientProtocol
 
+# libyaml-backed C loader (~10x faster); fall back if PyYAML lacks libyaml
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,6 +49,10 @@ _CHANNEL_QUEUE_SIZES = {
     'topic.hz': 100,        # low traffic, periodic stats
 }
 
+# A node's lifecycle-ness is stable while it runs; cache answers briefly so
+# concurrent checks for the same node share one RPC instead of racing.
+_LIFECYCLE_CACHE_TTL = 5.0  # seconds, matches the node poll interval
+
 
 class AgentConnection:
     """Connection to monitoring_agent ROS2 node via WebSocket."""
@@ -59,6 +68,7 @@ class AgentConnection:
         self._connected = False
         self._disconnect_event = asyncio.Event()
         self._connect_event = asyncio.Event()
+        self._lifecycle_cache: dict[str, tuple[float, bool]] = {}
         self.container = ""
 
     @property
@@ -389,9 +399,8 @@ class AgentConnection:
 
     async def ros2_service_call(self, service_name: str, service_type: str,
                                 request_yaml: str) -> str:
-        import yaml
         try:
-            request_dict = yaml.safe_load(request_yaml) or {}
+            request_dict = yaml.load(request_yaml, Loader=_YAML_LOADER) or {}
         except Exception:
             request_dict = {}
         result = await self._call('service.call', {
@@ -402,8 +411,13 @@ class AgentConnection:
         return json.dumps(result.get('response', {}), indent=2)
 
     async def is_lifecycle_node(self, node_name: str) -> bool:
+        cached = self._lifecycle_cache.get(node_name)
+        if cached is not None and time.monotonic() - cached[0] < _LIFECYCLE_CACHE_TTL:
+            return cached[1]
         result = await self._call('lifecycle.is_lifecycle', {'node': node_name})
-        return result.get('is_lifecycle', False)
+        is_lifecycle = result.get('is_lifecycle', False)
+        self._lifecycle_cache[node_name] = (time.monotonic(), is_lifecycle)
+        return is_lifecycle
 
     async def ros2_lifecycle_get_state(self, node_name: str) -> Optional[str]:
         try:
@@ -443,7 +457,8 @@ class AgentConnection:
             return None
 
     def invalidate_services_cache(self) -> None:
-        pass
+        """Drop cached lifecycle answers (e.g. after a lifecycle transition)."""
+        self._lifecycle_cache.clear()
 
     # === Command translation helpers ===
 
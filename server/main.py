@@ -1,5 +1,6 @@
 """Tram Monitoring System - Main Application."""
 
+import asyncio
 import logging
 from logging.handlers import RotatingFileHandler
 from contextlib import asynccontextmanager
@@ -9,10 +10,12 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-from fastapi import FastAPI, Request, HTTPException
+import mimetypes
+
+from fastapi import FastAPI, Request, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 
 
 # --- File logging setup (overwritten on each restart) ---
@@ -83,11 +86,9 @@ _uv_access.propagate = False
 from .models import ServerConfig
 from .connection import AgentConnection, ConnectionError, ContainerNotFoundError
 from .state import StatePersister
-# from .services import NodeServicee
 from .routers import servers_router, nodes_router, websocket_router, debug_router, topics_router, history_router, dashboard_router, services_router
 from .config import settings, load_servers_config, get_server_by_id, load_alert_config, load_topic_groups_config
 from .services import NodeService, AlertService, TopicHzMonitor, SharedEchoMonitor, SharedDiagnosticsCollector, SharedNodeStatusBroadcaster, HistoryStore, LogCollector, MetricsLogger
-from fastapi.responses import FileResponse, JSONResponse
 
 
 @dataclass
@@ -146,10 +147,9 @@ async def connect_to_server(server: ServerConfig) -> None:
     connection = AgentConnection(agent_url=server.agent_url)
     await connection.connect()
 
-    # Initialize persister and service
+    # Initialize persister and service (loads state eagerly)
     persister = StatePersister(server.id)
-    persister.load()
-    
+
     node_service = NodeService(connection, persister)
 
     # Initialize alert service (shares node_service cache to avoid duplicate polling)
@@ -171,6 +171,7 @@ async def connect_to_server(server: ServerConfig) -> None:
 
     # Initialize shared node status broadcaster (one polling loop, fan-out to all WS clients)
     shared_node_status = SharedNodeStatusBroadcaster()
+    shared_node_status.alert_service = alert_service  # same poll drives node alerts
     await shared_node_status.start(node_service, disconnect_server)
 
     # Initialize history store (persistent log/alert storage)
@@ -247,6 +248,10 @@ async def disconnect_server() -> None:
         await app_state.alert_service.stop()
         app_state.alert_service = None
 
+    # Stop node service background tasks
+    if app_state.node_service:
+        await app_state.node_service.stop()
+
     # Disconnect
     if app_state.connection:
         try:
@@ -258,6 +263,8 @@ async def disconnect_server() -> None:
     # Clear state
     app_state.node_service = None
     app_state.current_server_id = None
+    if app_state.persister:
+        app_state.persister.flush()  # write any pending debounced save
     app_state.persister = None
 
     logger.info("Disconnected from server")
@@ -265,8 +272,6 @@ async def disconnect_server() -> None:
 
 async def _auto_connect_loop():
     """Background task: retry connecting to first server until success."""
-    import asyncio
-
     servers = load_servers_config()
     if not servers:
         return
@@ -289,10 +294,9 @@ async def _auto_connect_loop():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    import asyncio
-
     # Startup
     logger.info("Tram Monitoring System starting...")
+    logger.info(f"Event loop: {asyncio.get_running_loop().__class__.__module__}")
 
     # Ensure data directory exists
     settings.data_dir.mkdir(parents=True, exist_ok=True)
@@ -348,7 +352,6 @@ async def lifespan(app: FastAPI):
 
 async def _shutdown_services() -> None:
     """Stop all services in parallel."""
-    import asyncio
     tasks = []
     if app_state.metrics_logger:
         tasks.append(app_state.metrics_logger.stop())
@@ -364,18 +367,24 @@ async def _shutdown_services() -> None:
         tasks.append(app_state.shared_node_status.stop())
     if app_state.alert_service:
         tasks.append(app_state.alert_service.stop())
+    if app_state.node_service:
+        tasks.append(app_state.node_service.stop())
     if app_state.history_store:
         tasks.append(app_state.history_store.close())
     if tasks:
         await asyncio.gather(*tasks, return_exceptions=True)
+    if app_state.persister:
+        app_state.persister.flush()  # write any pending debounced save
 
 
-# Create FastAPI app
+# Create FastAPI app (orjson encodes responses 3-5x faster than stdlib json,
+# which matters for /api/nodes responses with hundreds of entries)
 app = FastAPI(
     title="Tram Monitoring System",
     description="Web interface for managing ROS2 nodes in Docker containers",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -401,17 +410,9 @@ app.include_router(services_router)
 # === Health check (must be before SPA catch-all) ===
 
 @app.get("/health")
-async def health():
-    return {
-        "status": "ok",
-        "connected": app_state.connection is not None and app_state.connection.connected,
-        "server": app_state.current_server_id,
-    }
-
-
 @app.get("/api/health")
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint (also at /health for deploy scripts)."""
     return {
         "status": "ok",
         "connected": app_state.connection is not None and app_state.connection.connected,
@@ -421,8 +422,6 @@ async def health_check():
 
 # === Static files and SPA routing (Production) ===
 
-from fastapi.responses import JSONResponse
-
 STATIC_DIR = Path(__file__).parent.parent / "web" / "dist"
 ASSETS_DIR = STATIC_DIR / "assets"
 
@@ -431,6 +430,30 @@ if ASSETS_DIR.exists():
     app.mount("/assets", StaticFiles(directory=str(ASSETS_DIR)), name="assets")
 
 
+def _build_static_index() -> dict[str, tuple[bytes, str]]:
+    """Preload small static files (url path -> (content, media type)).
+
+    The SPA asset storm on page load hits serve_spa with many small files;
+    serving them from memory avoids a stat + open + read per request.
+    Files under /assets are handled by the StaticFiles mount, large files
+    (>1 MB) still go through FileResponse.
+    """
+    index: dict[str, tuple[bytes, str]] = {}
+    if not STATIC_DIR.exists():
+        return index
+    for path in STATIC_DIR.rglob("*"):
+        if not path.is_file() or ASSETS_DIR in path.parents:
+            continue
+        if path.stat().st_size > 1024 * 1024:
+            continue
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        index[path.relative_to(STATIC_DIR).as_posix()] = (path.read_bytes(), media_type)
+    return index
+
+
+_static_index = _build_static_index()
+
+
 @app.get("/{full_path:path}")
 async def serve_spa(request: Request, full_path: str):
     """Serve React SPA for all non-API routes."""
@@ -438,20 +461,30 @@ async def serve_spa(request: Request, full_path: str):
     if full_path.startswith("api/") or full_path.startswith("ws/"):
         raise HTTPException(status_code=404, detail="Not found")
 
+    # Exact file from the in-memory index (no syscalls)
+    cached = _static_index.get(full_path)
+    if cached is None and full_path in ("", "/"):
+        cached = _static_index.get("index.html")
+    if cached is not None:
+        return Response(content=cached[0], media_type=cached[1])
+
     # Check if static build exists
     index_file = STATIC_DIR / "index.html"
     if not index_file.exists():
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={"message": "Tram Monitoring System API", "docs": "/docs", "mode": "development"}
         )
 
-    # Try to serve the exact file first
+    # Large files not in the index
     file_path = STATIC_DIR / full_path
     if file_path.is_file():
         return FileResponse(file_path)
 
     # Otherwise serve index.html (SPA routing)
+    spa_index = _static_index.get("index.html")
+    if spa_index is not None:
+        return Response(content=spa_index[0], media_type=spa_index[1])
     return FileResponse(index_file)
 
 
@@ -461,5 +494,6 @@ if __name__ == "__main__":
         "server.main:app",
         host=settings.host,
         port=settings.port,
-        reload=True
+        reload=True,
+        loop="uvloop",  # libuv selector + C-accelerated transports
     )
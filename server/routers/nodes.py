@@ -1,8 +1,8 @@
 """Node management router."""
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from typing import Optional
+from typing import Annotated, Optional
 import asyncio
 
 from ..models import NodesResponse, NodeDetailResponse, ActionResponse, NodeType
@@ -10,6 +10,16 @@ from ..models import NodesResponse, NodeDetailResponse, ActionResponse, NodeType
 router = APIRouter(prefix="/api/nodes", tags=["nodes"])
 
 
+def norm_node_name(node_name: str) -> str:
+    """Normalize a node name from the URL path to its leading-slash form."""
+    return node_name if node_name.startswith("/") else "/" + node_name
+
+
+# Resolved once per request via Depends() instead of being re-checked
+# inline in every handler.
+NodeName = Annotated[str, Depends(norm_node_name)]
+
+
 def get_node_service():
     """Get node service or raise error."""
     from ..main import app_state
@@ -31,13 +41,10 @@ async def list_nodes(refresh: bool = Query(True, description="Refresh from ROS2"
 
 
 @router.get("/{node_name:path}/params")
-async def get_node_params(node_name: str):
+async def get_node_params(node_name: NodeName):
     """Fetch parameters for a node on demand."""
     service = get_node_service()
 
-    if not node_name.startswith("/"):
-        node_name = "/" + node_name
-
     params = await service.get_node_params(node_name)
     if params is None:
         raise HTTPException(404, f"Node '{node_name}' not found")
@@ -46,7 +53,7 @@ async def get_node_params(node_name: str):
 
 
 @router.get("/{node_name:path}", response_model=NodeDetailResponse)
-async def get_node_detail(node_name: str, refresh: bool = Query(True, description="Fetch fresh data from ROS2")):
+async def get_node_detail(node_name: NodeName, refresh: bool = Query(True, description="Fetch fresh data from ROS2")):
     """
     Get detailed information about a node.
     - refresh=False: Return cached data immediately (fast)
@@ -54,9 +61,6 @@ async def get_node_detail(node_name: str, refresh: bool = Query(True, descriptio
     """
     service = get_node_service()
 
-    if not node_name.startswith("/"):
-        node_name = "/" + node_name
-
     result = await service.get_node_detail(node_name, refresh=refresh)
 
     if not result:
@@ -70,16 +74,13 @@ class LifecycleRequest(BaseModel):
 
 
 @router.post("/{node_name:path}/lifecycle", response_model=ActionResponse)
-async def lifecycle_transition(node_name: str, request: LifecycleRequest):
+async def lifecycle_transition(node_name: NodeName, request: LifecycleRequest):
     """
     Perform lifecycle transition on a node.
     Valid transitions: configure, activate, deactivate, shutdown, cleanup
     """
     service = get_node_service()
-    
-    if not node_name.startswith("/"):
-        node_name = "/" + node_name
-    
+
     valid_transitions = ["configure", "activate", "deactivate", "shutdown", "cleanup"]
     if request.transition not in valid_transitions:
         return ActionResponse(
@@ -96,13 +97,10 @@ class ShutdownRequest(BaseModel):
 
 
 @router.post("/{node_name:path}/shutdown", response_model=ActionResponse)
-async def shutdown_node(node_name: str, request: ShutdownRequest):
+async def shutdown_node(node_name: NodeName, request: ShutdownRequest):
     """Shutdown a node."""
     service = get_node_service()
-    
-    if not node_name.startswith("/"):
-        node_name = "/" + node_name
-    
+
     success, message = await service.shutdown_node(node_name, force=request.force)
     return ActionResponse(success=success, message=message)
 
@@ -132,11 +130,10 @@ async def group_action(request: GroupActionRequest):
     if not namespace.startswith("/"):
         namespace = "/" + namespace
     
-    # Get all nodes in namespace
-    all_nodes = service.persister.get_all_nodes()
+    # Get all active nodes in namespace (indexed lookup, no full-dict scan)
     target_nodes = [
-        node for name, node in all_nodes.items()
-        if name.startswith(namespace) and node.status.value == "active"
+        node for node in service.persister.get_nodes_in_namespace(namespace)
+        if node.status.value == "active"
     ]
     
     if not target_nodes:
@@ -148,60 +145,55 @@ async def group_action(request: GroupActionRequest):
             results=[]
         )
     
+    # Run per-node actions concurrently (bounded) — each one is an
+    # independent RPC, so K nodes cost ~1 round-trip instead of K.
+    sem = asyncio.Semaphore(16)
+
+    async def _one(node) -> tuple[str, Optional[bool], str]:
+        """Returns (name, success, message); success=None means skipped."""
+        if node.type == NodeType.UNKNOWN:
+            return node.name, None, "Skipped: node type unknown (still detecting)"
+
+        async with sem:
+            try:
+                if request.action == "shutdown":
+                    if node.type == NodeType.LIFECYCLE:
+                        return node.name, *await service.lifecycle_transition(node.name, "shutdown")
+                    elif node.type == NodeType.REGULAR and request.force:
+                        return node.name, *await service.shutdown_node(node.name, force=True)
+                    else:
+                        return node.name, False, "Cannot shutdown regular node without force"
+                elif request.action == "kill":
+                    if node.type == NodeType.LIFECYCLE:
+                        # For lifecycle nodes, try shutdown first
+                        return node.name, *await service.lifecycle_transition(node.name, "shutdown")
+                    else:
+                        return node.name, *await service.shutdown_node(node.name, force=True)
+                else:
+                    return node.name, False, f"Unknown action: {request.action}"
+            except Exception as e:
+                return node.name, False, str(e)
+
+    outcomes = await asyncio.gather(*[_one(node) for node in target_nodes])
+
     results = []
     succeeded = 0
     failed = 0
     skipped = 0
-    
-    for node in target_nodes:
-        try:
-            # Skip unknown nodes
-            if node.type == NodeType.UNKNOWN:
-                results.append({
-                    "node": node.name,
-                    "success": False,
-                    "message": "Skipped: node type unknown (still detecting)"
-                })
-                skipped += 1
-                continue
-            
-            if request.action == "shutdown":
-                if node.type == NodeType.LIFECYCLE:
-                    success, message = await service.lifecycle_transition(node.name, "shutdown")
-                elif node.type == NodeType.REGULAR and request.force:
-                    success, message = await service.shutdown_node(node.name, force=True)
-                else:
-                    success = False
-                    message = f"Cannot shutdown regular node without force"
-            elif request.action == "kill":
-                if node.type == NodeType.LIFECYCLE:
-                    # For lifecycle nodes, try shutdown first
-                    success, message = await service.lifecycle_transition(node.name, "shutdown")
-                else:
-                    success, message = await service.shutdown_node(node.name, force=True)
-            else:
-                success = False
-                message = f"Unknown action: {request.action}"
-            
-            results.append({
-                "node": node.name,
-                "success": success,
-                "message": message
-            })
-            
-            if success:
-                succeeded += 1
-            else:
-                failed += 1
-                
-        except Exception as e:
-            results.append({
-                "node": node.name,
-                "success": False,
-                "message": str(e)
-            })
+
+    for name, success, message in outcomes:
+        results.append({
+            "node": name,
+            "success": bool(success),
+            "message": message
+        })
+        if success is None:
+            skipped += 1
+        elif success:
+            succeeded += 1
+        else:
             failed += 1
-    
+
     return GroupActionResponse(
         success=failed == 0 and skipped == 0,
         total=len(target_nodes),
@@ -3,6 +3,8 @@
 import asyncio
 import logging
 from datetime import datetime
+
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,16 @@ from ..config import load_topic_groups_config
 
 router = APIRouter(tags=["websocket"])
 
+
+async def _send_json(websocket: WebSocket, obj: dict) -> None:
+    """Send a dict as one orjson-encoded text frame.
+
+    ~3-5x faster than send_json (stdlib json.dumps) and serializes
+    datetime natively — no .isoformat() string alloc per message. Text
+    frames keep browser clients' JSON.parse(event.data) working as-is.
+    """
+    await websocket.send_text(orjson.dumps(obj).decode())
+
 @router.websocket("/ws/nodes/status")
 async def nodes_status_websocket(websocket: WebSocket):
     """WebSocket for real-time node status updates."""
@@ -24,7 +36,7 @@ async def nodes_status_websocket(websocket: WebSocket):
 
     broadcaster = app_state.shared_node_status
     if not broadcaster:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "disconnected",
             "message": "Not connected to server"
         })
@@ -40,7 +52,7 @@ async def nodes_status_websocket(websocket: WebSocket):
             msg = await queue.get()
             if msg is None:
                 break
-            await websocket.send_json(msg)
+            await _send_json(websocket, msg)
 
     except WebSocketDisconnect:
         pass
@@ -64,7 +76,7 @@ async def diagnostics_websocket(websocket: WebSocket):
 
     collector = app_state.shared_diagnostics
     if not collector:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "error",
             "message": "Not connected to server"
         })
@@ -76,7 +88,7 @@ async def diagnostics_websocket(websocket: WebSocket):
     collector.subscribe(queue)
 
     try:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "connected",
             "message": "Streaming diagnostics"
         })
@@ -87,15 +99,15 @@ async def diagnostics_websocket(websocket: WebSocket):
                 break  # service stopped
             dropped = queue.reset_dropped()
             if dropped:
-                await websocket.send_json({"type": "dropped", "count": dropped})
-            await websocket.send_json(msg)
+                await _send_json(websocket, {"type": "dropped", "count": dropped})
+            await _send_json(websocket, msg)
 
     except WebSocketDisconnect:
         pass
     except Exception as e:
         logger.error(f"Diagnostics WebSocket error: {e}")
         try:
-            await websocket.send_json({"type": "error", "message": str(e)})
+            await _send_json(websocket, {"type": "error", "message": str(e)})
         except:
             pass
     finally:
@@ -112,7 +124,7 @@ async def all_logs_websocket(websocket: WebSocket):
     metrics.ws_connect("log_all")
 
     if not app_state.log_collector:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "error",
             "message": "Not connected to server"
         })
@@ -124,7 +136,7 @@ async def all_logs_websocket(websocket: WebSocket):
     app_state.log_collector.subscribe_all(queue)
 
     try:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "connected",
             "message": "Streaming all logs"
         })
@@ -132,11 +144,11 @@ async def all_logs_websocket(websocket: WebSocket):
         # Send history from in-memory ring buffer
         history = app_state.log_collector.get_recent_logs(limit=1000, max_age_seconds=300)
         if history:
-            await websocket.send_json({
+            await _send_json(websocket, {
                 "type": "history",
                 "logs": [
                     {
-                        "timestamp": m.timestamp.isoformat(),
+                        "timestamp": m.timestamp,
                         "level": m.level,
                         "node_name": m.node_name,
                         "message": m.message,
@@ -152,10 +164,10 @@ async def all_logs_websocket(websocket: WebSocket):
             # LogMessage is not a dict, so _dropped won't be attached — use reset_dropped()
             dropped = queue.reset_dropped()
             if dropped:
-                await websocket.send_json({"type": "dropped", "count": dropped})
-            await websocket.send_json({
+                await _send_json(websocket, {"type": "dropped", "count": dropped})
+            await _send_json(websocket, {
                 "type": "log",
-                "timestamp": log_msg.timestamp.isoformat(),
+                "timestamp": log_msg.timestamp,
                 "level": log_msg.level,
                 "node_name": log_msg.node_name,
                 "message": log_msg.message,
@@ -166,7 +178,7 @@ async def all_logs_websocket(websocket: WebSocket):
     except Exception as e:
         logger.error(f"All-logs WebSocket error: {e}")
         try:
-            await websocket.send_json({"type": "error", "message": str(e)})
+            await _send_json(websocket, {"type": "error", "message": str(e)})
         except Exception:
             pass
     finally:
@@ -188,7 +200,7 @@ async def node_logs_websocket(websocket: WebSocket, node_name: str):
         node_name = "/" + node_name
 
     if not app_state.log_collector:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "error",
             "message": "Not connected to server"
         })
@@ -200,7 +212,7 @@ async def node_logs_websocket(websocket: WebSocket, node_name: str):
     app_state.log_collector.subscribe(node_name, queue)
 
     try:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "connected",
             "message": f"Streaming logs for {node_name}"
         })
@@ -210,11 +222,11 @@ async def node_logs_websocket(websocket: WebSocket, node_name: str):
             node_name=node_name, limit=1000, max_age_seconds=300
         )
         if history:
-            await websocket.send_json({
+            await _send_json(websocket, {
                 "type": "history",
                 "logs": [
                     {
-                        "timestamp": m.timestamp.isoformat(),
+                        "timestamp": m.timestamp,
                         "level": m.level,
                         "message": m.message,
                     }
@@ -229,10 +241,10 @@ async def node_logs_websocket(websocket: WebSocket, node_name: str):
             # LogMessage is not a dict, so _dropped won't be attached — use reset_dropped()
             dropped = queue.reset_dropped()
             if dropped:
-                await websocket.send_json({"type": "dropped", "count": dropped})
-            await websocket.send_json({
+                await _send_json(websocket, {"type": "dropped", "count": dropped})
+            await _send_json(websocket, {
                 "type": "log",
-                "timestamp": log_msg.timestamp.isoformat(),
+                "timestamp": log_msg.timestamp,
                 "level": log_msg.level,
                 "message": log_msg.message
             })
@@ -242,7 +254,7 @@ async def node_logs_websocket(websocket: WebSocket, node_name: str):
     except Exception as e:
         logger.error(f"Node logs WebSocket error for {node_name}: {e}")
         try:
-            await websocket.send_json({
+            await _send_json(websocket, {
                 "type": "error",
                 "message": str(e)
             })
@@ -276,7 +288,7 @@ async def alerts_websocket(websocket: WebSocket):
     metrics.ws_connect("alert")
 
     if not app_state.alert_service:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "error",
             "message": "Alert service not available"
         })
@@ -284,35 +296,32 @@ async def alerts_websocket(websocket: WebSocket):
         metrics.ws_disconnect("alert")
         return
 
+    queue = DroppableQueue(maxsize=100)
+    app_state.alert_service.subscribe_queue(queue)
+
     try:
         # Send initial connection confirmation
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "connected",
             "message": "Connected to alert stream"
         })
 
-        # Stream alerts
-        async for alert in app_state.alert_service.get_alerts():
-            try:
-                await websocket.send_json({
-                    "type": "alert",
-                    "id": alert.id,
-                    "alert_type": alert.alert_type.value,
-                    "severity": alert.severity.value,
-                    "title": alert.title,
-                    "message": alert.message,
-                    "timestamp": alert.timestamp.isoformat(),
-                    "details": alert.details
-                })
-            except Exception as e:
-                logger.error(f"Error sending alert: {e}")
-                break
+        # Stream alerts from a dedicated fan-out queue: every client gets
+        # every alert, and idle clients sleep until one is enqueued.
+        # Frames arrive pre-encoded by AlertService (one encode for all).
+        while True:
+            wire = await queue.get()
+            if wire is None:
+                break  # service stopped
+            await websocket.send_text(wire)
 
     except WebSocketDisconnect:
         pass
     except Exception as e:
         logger.error(f"Alerts WebSocket error: {e}")
     finally:
+        if app_state.alert_service:
+            app_state.alert_service.unsubscribe_queue(queue)
         metrics.ws_disconnect("alert")
 
 
@@ -328,7 +337,7 @@ async def topic_hz_websocket(websocket: WebSocket):
     metrics.ws_connect("topic_hz")
 
     if not app_state.topic_hz_monitor:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "error",
             "message": "Topic monitoring not active",
         })
@@ -337,7 +346,7 @@ async def topic_hz_websocket(websocket: WebSocket):
         return
 
     try:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "connected",
             "message": "Streaming topic Hz",
         })
@@ -345,10 +354,10 @@ async def topic_hz_websocket(websocket: WebSocket):
         while not app_state.is_shutting_down:
             if app_state.topic_hz_monitor:
                 groups = app_state.topic_hz_monitor.get_groups_with_hz()
-                await websocket.send_json({
+                await _send_json(websocket, {
                     "type": "hz_update",
                     "groups": groups,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": datetime.now(),
                 })
 
             # Sleep 2 seconds in 0.5s increments (to check shutdown)
@@ -362,7 +371,7 @@ async def topic_hz_websocket(websocket: WebSocket):
     except Exception as e:
         logger.error(f"Topic Hz WebSocket error: {e}")
         try:
-            await websocket.send_json({"type": "error", "message": str(e)})
+            await _send_json(websocket, {"type": "error", "message": str(e)})
         except:
             pass
     finally:
@@ -384,7 +393,7 @@ async def topic_echo_single_websocket(websocket: WebSocket, topic: str):
         topic = "/" + topic
 
     if not app_state.connection or not app_state.connection.connected:
-        await websocket.send_json({"type": "error", "message": "Not connected to server"})
+        await _send_json(websocket, {"type": "error", "message": "Not connected to server"})
         await websocket.close()
         metrics.ws_disconnect("topic_echo")
         return
@@ -392,7 +401,7 @@ async def topic_echo_single_websocket(websocket: WebSocket, topic: str):
     queue = DroppableQueue(maxsize=200)
     app_state.shared_echo_monitor.subscribe([topic], queue)
     try:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "connected",
             "message": f"Streaming echo for {topic}",
             "topic": topic,
@@ -404,15 +413,15 @@ async def topic_echo_single_websocket(websocket: WebSocket, topic: str):
                 break  # service stopped
             dropped = msg.pop("_dropped", 0) if isinstance(msg, dict) else 0
             if dropped:
-                await websocket.send_json({"type": "dropped", "count": dropped})
-            await websocket.send_json({"type": "echo", **msg})
+                await _send_json(websocket, {"type": "dropped", "count": dropped})
+            await _send_json(websocket, {"type": "echo", **msg})
 
     except WebSocketDisconnect:
         pass
     except Exception as e:
         logger.error(f"Single Topic Echo WebSocket error: {e}")
         try:
-            await websocket.send_json({"type": "error", "message": str(e)})
+            await _send_json(websocket, {"type": "error", "message": str(e)})
         except Exception:
             pass
     finally:
@@ -432,7 +441,7 @@ async def topic_hz_single_websocket(websocket: WebSocket, topic: str):
         topic = "/" + topic
 
     if not app_state.topic_hz_monitor:
-        await websocket.send_json({"type": "error", "message": "Topic monitoring not active"})
+        await _send_json(websocket, {"type": "error", "message": "Topic monitoring not active"})
         await websocket.close()
         metrics.ws_disconnect("topic_hz")
         return
@@ -440,7 +449,7 @@ async def topic_hz_single_websocket(websocket: WebSocket, topic: str):
     queue = DroppableQueue(maxsize=50)
     app_state.topic_hz_monitor.subscribe_topic(topic, queue)
     try:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "connected",
             "message": f"Monitoring Hz for {topic}",
             "topic": topic,
@@ -452,15 +461,15 @@ async def topic_hz_single_websocket(websocket: WebSocket, topic: str):
                 break
             dropped = msg.pop("_dropped", 0) if isinstance(msg, dict) else 0
             if dropped:
-                await websocket.send_json({"type": "dropped", "count": dropped})
-            await websocket.send_json(msg)
+                await _send_json(websocket, {"type": "dropped", "count": dropped})
+            await _send_json(websocket, msg)
 
     except WebSocketDisconnect:
         pass
     except Exception as e:
         logger.error(f"Single Topic Hz WebSocket error: {e}")
         try:
-            await websocket.send_json({"type": "error", "message": str(e)})
+            await _send_json(websocket, {"type": "error", "message": str(e)})
         except:
             pass
     finally:
@@ -481,7 +490,7 @@ async def topic_echo_websocket(websocket: WebSocket, group_id: str):
     metrics.ws_connect("topic_echo")
 
     if not app_state.connection or not app_state.connection.connected:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "error",
             "message": "Not connected to server",
         })
@@ -498,7 +507,7 @@ async def topic_echo_websocket(websocket: WebSocket, group_id: str):
             break
 
     if not group:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "error",
             "message": f"Group '{group_id}' not found",
         })
@@ -509,7 +518,7 @@ async def topic_echo_websocket(websocket: WebSocket, group_id: str):
     queue = DroppableQueue(maxsize=200)
     app_state.shared_echo_monitor.subscribe(group.topics, queue)
     try:
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "connected",
             "message": f"Streaming echo for group '{group.name}'",
             "group_id": group.id,
@@ -522,8 +531,8 @@ async def topic_echo_websocket(websocket: WebSocket, group_id: str):
                 break  # service stopped
             dropped = msg.pop("_dropped", 0) if isinstance(msg, dict) else 0
             if dropped:
-                await websocket.send_json({"type": "dropped", "count": dropped})
-            await websocket.send_json({
+                await _send_json(websocket, {"type": "dropped", "count": dropped})
+            await _send_json(websocket, {
                 "type": "echo",
                 **msg,
             })
@@ -533,7 +542,7 @@ async def topic_echo_websocket(websocket: WebSocket, group_id: str):
     except Exception as e:
         logger.error(f"Topic Echo WebSocket error: {e}")
         try:
-            await websocket.send_json({"type": "error", "message": str(e)})
+            await _send_json(websocket, {"type": "error", "message": str(e)})
         except Exception:
             pass
     finally:
@@ -3,14 +3,17 @@
 import asyncio
 import logging
 import re
-from datetime import datetime, timedelta
-from typing import AsyncIterator, Optional, Callable, Set, Dict
+import time
+
+import orjson
+from typing import Optional, Callable, Set, Dict
 import uuid
 
 logger = logging.getLogger(__name__)
 
-from ..connection import AgentConnection
+from ..connection import AgentConnection, ConnectionError as ConnError
 from ..models import Alert, AlertType, AlertSeverity, AlertConfig, NodeStatus, LogMessage
+from .droppable_queue import DroppableQueue
 
 
 class AlertService:
@@ -34,30 +37,64 @@ class AlertService:
 
         # Node status tracking
         self._node_statuses: Dict[str, NodeStatus] = {}
+        self._snapshot_count = 0
 
-        # Alert deduplication: key -> last_alert_time
-        self._alert_cooldowns: Dict[str, datetime] = {}
+        # Alert deduplication: key -> time.monotonic() of last alert
+        # (float compare instead of datetime/timedelta churn per emit,
+        # immune to wall-clock jumps)
+        self._alert_cooldowns: Dict[str, float] = {}
 
-        # Alert queue for WebSocket subscribers
-        self._alert_queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        # Per-WebSocket fan-out queues: every alert reaches every client,
+        # and idle clients sleep until something is actually enqueued.
+        self._ws_queues: Set[DroppableQueue] = set()
 
-        # Subscribers (callbacks)
+        # Subscribers (callbacks); _subs_tuple is an immutable snapshot
+        # rebuilt on (un)subscribe so _emit_alert iterates a plain tuple
         self._subscribers: Dict[str, Callable[[Alert], None]] = {}
+        self._subs_tuple: tuple[Callable[[Alert], None], ...] = ()
 
         # Known missing topics (для отслеживания восстановления)
         self._missing_topics: Set[str] = set()
-
-        # Pre-compile error patterns for on_log_message callback
-        self._compiled_patterns: list[tuple[re.Pattern, str]] = []
+        # Previous topic-list snapshot — unchanged graph means nothing to do
+        self._prev_topics: Optional[frozenset[str]] = None
+
+        # Pre-compile error patterns for on_log_message callback.
+        # All patterns are merged into one named-group alternation so each
+        # log message is scanned once (O(M)) instead of once per pattern.
+        self._patterns_regex: Optional[re.Pattern] = None
+        self._pattern_by_group: Dict[str, tuple[str, str]] = {}
+        # Per-pattern fallback (compiled, pattern, severity) — used when
+        # the merged alternation doesn't compose
+        self._patterns_fallback: list[tuple[re.Pattern, str, str]] = []
         if self.config.error_patterns:
-            for p in self.config.error_patterns:
+            parts = []
+            compiled = []
+            for i, p in enumerate(self.config.error_patterns):
+                pattern = p["pattern"]
+                try:
+                    regex = re.compile(pattern, re.IGNORECASE)
+                except re.error as e:
+                    logger.warning(f"Invalid regex pattern '{pattern}': {e}")
+                    continue
+                severity = p.get("severity", "error")
+                compiled.append((regex, pattern, severity))
+                group = f"p{i}"
+                parts.append(f"(?P<{group}>{pattern})")
+                self._pattern_by_group[group] = (pattern, severity)
+            if parts:
                 try:
-                    self._compiled_patterns.append((
-                        re.compile(p["pattern"], re.IGNORECASE),
-                        p.get("severity", "error")
-                    ))
+                    self._patterns_regex = re.compile("|".join(parts), re.IGNORECASE)
                 except re.error as e:
-                    logger.warning(f"Invalid regex pattern '{p['pattern']}': {e}")
+                    # Patterns that don't compose (backreferences, clashing
+                    # named groups) — scan with the individually compiled
+                    # list instead, so one bad combination doesn't disable
+                    # pattern alerting entirely
+                    logger.warning(
+                        f"Failed to merge error patterns, "
+                        f"falling back to per-pattern scan: {e}"
+                    )
+                    self._pattern_by_group.clear()
+                    self._patterns_fallback = compiled
 
         # Running state
         self._running = False
@@ -73,10 +110,11 @@ class AlertService:
         logger.info("Alert service starting...")
 
         # Start monitoring tasks
-        # Note: rosout pattern matching is now handled by on_log_message() callback
-        # registered with LogCollector (single /rosout stream)
+        # Note: rosout pattern matching is handled by on_log_message()
+        # (LogCollector callback); node up/down detection is driven by
+        # SharedNodeStatusBroadcaster via apply_node_snapshot() — both
+        # piggyback on streams/polls that already exist.
         self._tasks = [
-            asyncio.create_task(self._monitor_nodes_loop()),
             asyncio.create_task(self._monitor_missing_topics()),
             asyncio.create_task(self._monitor_topic_values()),
         ]
@@ -88,15 +126,22 @@ class AlertService:
         self._running = False
         logger.info("Alert service stopping...")
         
+        # Cancel everything first, then await in one round-trip
         for task in self._tasks:
             task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-        
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
         self._tasks = []
         self._subscribers.clear()
+        self._subs_tuple = ()
+        # Wake websocket consumers so they can exit
+        for queue in list(self._ws_queues):
+            try:
+                queue.put_nowait(None)
+            except Exception:
+                pass
+        self._ws_queues.clear()
         logger.info("Alert service stopped")
 
     # ─────────────────────────────────────────────────────────────────
@@ -107,25 +152,20 @@ class AlertService:
         """Subscribe to alerts. Returns subscription ID."""
         sub_id = str(uuid.uuid4())
         self._subscribers[sub_id] = callback
+        self._subs_tuple = tuple(self._subscribers.values())
         return sub_id
 
     def unsubscribe(self, sub_id: str) -> None:
         """Unsubscribe from alerts."""
         self._subscribers.pop(sub_id, None)
+        self._subs_tuple = tuple(self._subscribers.values())
 
-    async def get_alerts(self) -> AsyncIterator[Alert]:
-        """Async iterator for alerts (for WebSocket)."""
-        while self._running:
-            try:
-                alert = await asyncio.wait_for(
-                    self._alert_queue.get(),
-                    timeout=1.0
-                )
-                yield alert
-            except asyncio.TimeoutError:
-                continue
-            except asyncio.CancelledError:
-                break
+    def subscribe_queue(self, queue: DroppableQueue) -> None:
+        """Register a WebSocket fan-out queue (same pattern as broadcasters)."""
+        self._ws_queues.add(queue)
+
+    def unsubscribe_queue(self, queue: DroppableQueue) -> None:
+        self._ws_queues.discard(queue)
 
     def update_node_status(self, node_name: str, status: NodeStatus) -> None:
         """
@@ -161,35 +201,70 @@ class AlertService:
                 cooldown_key=f"node_recovered:{node_name}"
             )
 
+    def apply_node_snapshot(self, current_nodes: Set[str]) -> None:
+        """
+        Apply an active-node snapshot from the shared status poll.
+        Called by SharedNodeStatusBroadcaster every tick — replaces the
+        dedicated _monitor_nodes_loop timer that duplicated that poll.
+        """
+        # Nodes that disappeared
+        for node_name, status in list(self._node_statuses.items()):
+            if status == NodeStatus.ACTIVE and node_name not in current_nodes:
+                self.update_node_status(node_name, NodeStatus.INACTIVE)
+
+        # Nodes that appeared / recovered
+        for node_name in current_nodes:
+            prev_status = self._node_statuses.get(node_name)
+            if prev_status == NodeStatus.INACTIVE:
+                self.update_node_status(node_name, NodeStatus.ACTIVE)
+            elif prev_status is None:
+                # New node, just track it
+                self._node_statuses[node_name] = NodeStatus.ACTIVE
+
+        # Periodic cleanup of stale dicts (~every 5 min at a 5 s tick)
+        self._snapshot_count += 1
+        if self._snapshot_count % 60 == 0:
+            self._cleanup_cooldowns()
+            self._cleanup_node_statuses()
+
     # ─────────────────────────────────────────────────────────────────
     # Callback from LogCollector (sync, called for every log message)
     # ─────────────────────────────────────────────────────────────────
 
     def on_log_message(self, log_msg: LogMessage) -> None:
         """Called by LogCollector for every /rosout message. Checks error patterns."""
-        if not self._compiled_patterns:
+        if not self._patterns_regex and not self._patterns_fallback:
             return
 
         msg = log_msg.message
         node_name = log_msg.node_name
 
-        for pattern, severity in self._compiled_patterns:
-            if pattern.search(msg):
-                display_msg = msg[:150] + "..." if len(msg) > 150 else msg
-
-                self._emit_alert(
-                    alert_type=AlertType.ERROR_PATTERN,
-                    severity=AlertSeverity(severity),
-                    title="Ошибка в логах",
-                    message=f"[{node_name}] {display_msg}",
-                    details={
-                        "node_name": node_name,
-                        "pattern": pattern.pattern,
-                        "full_message": msg
-                    },
-                    cooldown_key=f"error_pattern:{pattern.pattern}:{node_name}"
-                )
-                break  # Only one alert per message
+        if self._patterns_regex is not None:
+            match = self._patterns_regex.search(msg)
+            if not match:
+                return
+            pattern, severity = self._pattern_by_group[match.lastgroup]
+        else:
+            for regex, pattern, severity in self._patterns_fallback:
+                if regex.search(msg):
+                    break
+            else:
+                return
+
+        display_msg = msg[:150] + "..." if len(msg) > 150 else msg
+
+        self._emit_alert(
+            alert_type=AlertType.ERROR_PATTERN,
+            severity=AlertSeverity(severity),
+            title="Ошибка в логах",
+            message=f"[{node_name}] {display_msg}",
+            details={
+                "node_name": node_name,
+                "pattern": pattern,
+                "full_message": msg
+            },
+            cooldown_key=f"error_pattern:{pattern}:{node_name}"
+        )
 
     # ─────────────────────────────────────────────────────────────────
     # Internal: Alert emission with deduplication
@@ -210,13 +285,18 @@ class AlertService:
         """
         # Check cooldown
         if cooldown_key:
+            now = time.monotonic()
             last_alert = self._alert_cooldowns.get(cooldown_key)
-            if last_alert:
-                elapsed = datetime.now() - last_alert
-                if elapsed < timedelta(seconds=self.config.cooldown_seconds):
-                    return False  # Still in cooldown
-            
-            self._alert_cooldowns[cooldown_key] = datetime.now()
+            if last_alert is not None and now - last_alert < self.config.cooldown_seconds:
+                return False  # Still in cooldown
+            self._alert_cooldowns[cooldown_key] = now
+
+        # Nobody consumes the alert object (no sockets, no callbacks, no
+        # history store): cooldown is recorded above, skip building and
+        # encoding the Alert entirely
+        if not self._ws_queues and not self._subs_tuple and not self.history_store:
+            logger.info("Alert: [%s] %s: %s", severity.value, title, message)
+            return True
 
         # Create alert
         alert = Alert(
@@ -235,25 +315,31 @@ class AlertService:
             except Exception as e:
                 logger.error(f"Failed to persist alert: {e}")
 
-        # Add to queue (for WebSocket async iterator)
-        try:
-            self._alert_queue.put_nowait(alert)
-        except asyncio.QueueFull:
-            # Remove oldest and add new
-            try:
-                self._alert_queue.get_nowait()
-                self._alert_queue.put_nowait(alert)
-            except:
-                pass
-
-        # Notify subscribers
-        for callback in self._subscribers.values():
+        # Fan out to WebSocket subscriber queues (drop-on-overflow).
+        # The wire envelope is encoded once here, so N subscribers cost
+        # one orjson.dumps instead of one per socket.
+        if self._ws_queues:
+            wire = orjson.dumps({
+                "type": "alert",
+                "id": alert.id,
+                "alert_type": alert.alert_type.value,
+                "severity": alert.severity.value,
+                "title": alert.title,
+                "message": alert.message,
+                "timestamp": alert.timestamp,
+                "details": alert.details,
+            }).decode()
+            for queue in list(self._ws_queues):
+                queue.put_nowait(wire)
+
+        # Notify subscribers (tuple snapshot — safe against mutation)
+        for callback in self._subs_tuple:
             try:
                 callback(alert)
             except Exception as e:
                 logger.error(f"Error in alert subscriber: {e}")
 
-        logger.info(f"Alert: [{severity.value}] {title}: {message}")
+        logger.info("Alert: [%s] %s: %s", severity.value, title, message)
         return True
 
     @staticmethod
@@ -267,8 +353,8 @@ class AlertService:
 
     def _cleanup_cooldowns(self) -> None:
         """Remove expired cooldown entries to prevent unbounded dict growth."""
-        now = datetime.now()
-        cutoff = timedelta(seconds=self.config.cooldown_seconds * 2)
+        now = time.monotonic()
+        cutoff = self.config.cooldown_seconds * 2
         expired = [k for k, v in self._alert_cooldowns.items() if (now - v) > cutoff]
         for k in expired:
             del self._alert_cooldowns[k]
@@ -287,57 +373,6 @@ class AlertService:
     # Background monitoring tasks
     # ─────────────────────────────────────────────────────────────────
 
-    async def _monitor_nodes_loop(self) -> None:
-        """
-        Background task to monitor node statuses.
-        Uses NodeService cached data instead of calling ros2 node list directly.
-        """
-        _iterations = 0
-        while self._running:
-            try:
-                # Use NodeService cached node list (no extra ros2 CLI call)
-                if self.node_service:
-                    response = self.node_service.get_cached_nodes()
-                    current_nodes = {
-                        n.name for n in response.nodes
-                        if n.status == NodeStatus.ACTIVE
-                    }
-                else:
-                    # Fallback: call ros2 directly (shouldn't happen normally)
-                    nodes = await self.conn.ros2_node_list()
-                    current_nodes = set(nodes)
-
-                # Check for nodes that disappeared
-                for node_name, status in list(self._node_statuses.items()):
-                    if status == NodeStatus.ACTIVE and node_name not in current_nodes:
-                        self.update_node_status(node_name, NodeStatus.INACTIVE)
-
-                # Check for nodes that appeared
-                for node_name in current_nodes:
-                    prev_status = self._node_statuses.get(node_name)
-                    if prev_status == NodeStatus.INACTIVE:
-                        self.update_node_status(node_name, NodeStatus.ACTIVE)
-                    elif prev_status is None:
-                        # New node, just track it
-                        self._node_statuses[node_name] = NodeStatus.ACTIVE
-
-                # Periodic cleanup of stale dicts (~every 5 min)
-                _iterations += 1
-                if _iterations % 60 == 0:
-                    self._cleanup_cooldowns()
-                    self._cleanup_node_statuses()
-
-                await asyncio.sleep(5)
-
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in node monitoring: {e}")
-                if self._running and not self.conn.connected:
-                    await self.conn.wait_connected()
-                if self._running:
-                    await asyncio.sleep(5)
-
     async def _monitor_missing_topics(self) -> None:
         """Monitor for missing important topics. Backs off on repeated failures."""
         if not self.config.important_topics:
@@ -347,13 +382,17 @@ class AlertService:
 
         while self._running:
             try:
-                # Get current topic list
-                output = await self.conn.exec_command("ros2 topic list", timeout=10.0)
-                current_topics = set(
-                    line.strip()
-                    for line in output.strip().split("\n")
-                    if line.strip().startswith("/")
-                )
+                # Get current topic list directly from the graph API —
+                # no text round-trip (join + strip + split) to parse
+                topics = await self.conn.ros2_topic_list(timeout=10.0)
+                current_topics = frozenset(t["name"] for t in topics)
+
+                # Alerts only fire on membership transitions, so an
+                # unchanged topic set means nothing to check this round
+                if current_topics == self._prev_topics:
+                    await asyncio.sleep(interval)
+                    continue
+                self._prev_topics = current_topics
 
                 for topic in self.config.important_topics:
                     # Topic missing
@@ -385,8 +424,9 @@ class AlertService:
 
             except asyncio.CancelledError:
                 break
-            except Exception as e:
-                logger.error(f"Error monitoring topics: {e}")
+            except (ConnError, asyncio.TimeoutError, OSError) as e:
+                # Expected transient failures: warn and back off
+                logger.warning("Error monitoring topics: %s", e)
                 if self._running and not self.conn.connected:
                     await self.conn.wait_connected()
                     interval = 10
@@ -394,6 +434,11 @@ class AlertService:
                     interval = min(interval * 2, 120)  # backoff: 10→20→40→80→120s max
                 if self._running:
                     await asyncio.sleep(interval)
+            except Exception:
+                # Unexpected bug — keep the supervisor alive but make noise
+                logger.exception("Unexpected error monitoring topics")
+                if self._running:
+                    await asyncio.sleep(interval)
 
     async def _monitor_topic_values(self) -> None:
         """Monitor specific topics for alert values."""
@@ -415,11 +460,16 @@ class AlertService:
             raise
 
     async def _monitor_single_topic(self, topic_config: dict) -> None:
-        """Monitor a single topic for specific values."""
+        """Monitor a single topic for specific values.
+
+        One persistent agent subscription per topic instead of a
+        'ros2 topic echo --once' round-trip every 2 seconds — no repeated
+        DDS join/leave, and value changes are seen immediately.
+        """
         topic = topic_config.get("topic", "")
         field = topic_config.get("field", "data")
         alert_value = topic_config.get("alert_on_value", False)
-        
+
         if not topic:
             return
 
@@ -427,18 +477,21 @@ class AlertService:
 
         while self._running:
             try:
-                output = await self.conn.exec_command(
-                    f"ros2 topic echo {topic} --once",
-                    timeout=10.0
-                )
-
-                # Parse the field value
-                field_match = re.search(rf"{field}:\s*(\S+)", output)
-                if field_match:
-                    value_str = field_match.group(1).lower().strip()
-                    value = value_str in ('true', '1', 'yes')
-
-                    # Alert on matching value
+                async for data in self.conn.subscribe_json(
+                    'topic.echo', {'topic': topic, 'no_arr': True}
+                ):
+                    if not self._running:
+                        break
+                    msg_data = data.get('data', {}) if isinstance(data, dict) else {}
+                    raw = msg_data.get(field)
+                    if raw is None:
+                        continue
+                    if isinstance(raw, bool):
+                        value = raw
+                    else:
+                        value = str(raw).lower().strip() in ('true', '1', 'yes')
+
+                    # Alert on matching value (edge-triggered)
                     if value == alert_value and not last_alerted:
                         last_alerted = True
                         self._emit_alert(
@@ -456,12 +509,15 @@ class AlertService:
                     elif value != alert_value:
                         last_alerted = False
 
-                await asyncio.sleep(2)  # Check every 2 seconds
-
             except asyncio.CancelledError:
                 break
-            except Exception:
+            except (ConnError, asyncio.TimeoutError, OSError) as e:
+                logger.warning("Error monitoring topic %s: %s", topic, e)
                 if self._running and not self.conn.connected:
                     await self.conn.wait_connected()
                 if self._running:
                     await asyncio.sleep(2)
+            except Exception:
+                logger.exception("Unexpected error monitoring topic %s", topic)
+                if self._running:
+                    await asyncio.sleep(2)
@@ -6,7 +6,9 @@ import asyncio
 class DroppableQueue:
     """asyncio.Queue wrapper that tracks dropped messages.
 
-    When the queue is full, put_nowait() silently increments a drop counter
+    When the queue is full, put_nowait() evicts the oldest entry to make
+    room for the new one (slow consumers see the freshest data, and a
+    stop-sentinel can never be lost) and increments a drop counter
     instead of raising QueueFull.  The next successful get() attaches the
     accumulated drop count to the returned item (if it's a dict) via the
     ``_dropped`` key, then resets the counter.
@@ -26,10 +28,15 @@ class DroppableQueue:
         self._dropped: int = 0
 
     def put_nowait(self, item) -> None:
-        """Try to enqueue *item*. If the queue is full, increment the drop counter."""
+        """Enqueue *item*; when full, evict the oldest entry and count the drop."""
         try:
             self._queue.put_nowait(item)
         except asyncio.QueueFull:
+            try:
+                self._queue.get_nowait()  # drop-head: newest data wins
+            except asyncio.QueueEmpty:
+                pass
+            self._queue.put_nowait(item)
             self._dropped += 1
 
     async def get(self):
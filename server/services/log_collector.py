@@ -13,6 +13,10 @@ from .droppable_queue import DroppableQueue
 
 logger = logging.getLogger(__name__)
 
+# rcl log severities come in fixed steps of 10 (10=DEBUG .. 50=FATAL);
+# index by level // 10 — cheaper than a dict lookup on the per-message path
+_LEVEL_NAMES = ("INFO", "DEBUG", "INFO", "WARN", "ERROR", "FATAL")
+
 
 class LogCollector:
     """
@@ -29,14 +33,22 @@ class LogCollector:
         self._running = False
         self._task: Optional[asyncio.Task] = None
 
-        # Queue-based subscribers (for WebSocket clients)
-        # Accept both asyncio.Queue and DroppableQueue
-        self._subscribers: dict[str, set] = defaultdict(set)
-        self._all_subscribers: set = set()
+        # Queue-based subscribers (for WebSocket clients).
+        # All endpoints hand us DroppableQueue — put_nowait never raises,
+        # it evicts the oldest entry and counts the drop.
+        self._subscribers: dict[str, set[DroppableQueue]] = defaultdict(set)
+        self._all_subscribers: set[DroppableQueue] = set()
 
         # Reverse lookup for O(1) dispatch
-        self._full_name_queues: dict[str, set] = defaultdict(set)   # full_name -> queues
-        self._short_name_queues: dict[str, set] = defaultdict(set)  # short_name -> queues
+        self._full_name_queues: dict[str, set[DroppableQueue]] = defaultdict(set)   # full_name -> queues
+        self._short_name_queues: dict[str, set[DroppableQueue]] = defaultdict(set)  # short_name -> queues
+
+        # Immutable snapshots of the sets above, rebuilt on (un)subscribe.
+        # _dispatch iterates these: tuple iteration is cheaper than set
+        # iteration and safe if a client (un)subscribes mid-dispatch.
+        self._all_subs_snapshot: tuple[DroppableQueue, ...] = ()
+        self._full_name_snapshot: dict[str, tuple[DroppableQueue, ...]] = {}
+        self._short_name_snapshot: dict[str, tuple[DroppableQueue, ...]] = {}
 
         # Callback subscribers (for HistoryStore, AlertService)
         self._callbacks: list[Callable[[LogMessage], None]] = []
@@ -44,14 +56,6 @@ class LogCollector:
         # In-memory history ring buffer (all levels, for quick replay on WS connect)
         self._history: deque[LogMessage] = deque(maxlen=5000)
 
-        # Parsing
-        self._level_map = {
-            10: "DEBUG",
-            20: "INFO",
-            30: "WARN",
-            40: "ERROR",
-            50: "FATAL",
-        }
 
     async def start(self) -> None:
         """Start the background /rosout stream."""
@@ -88,21 +92,25 @@ class LogCollector:
         self._subscribers.clear()
         self._full_name_queues.clear()
         self._short_name_queues.clear()
+        self._all_subs_snapshot = ()
+        self._full_name_snapshot.clear()
+        self._short_name_snapshot.clear()
         logger.info("Log collector stopped")
 
     # ─────────────────────────────────────────────────────────────────
     # Queue-based subscriptions (for WebSocket endpoints)
     # ─────────────────────────────────────────────────────────────────
 
-    def subscribe(self, node_name: str, queue: asyncio.Queue) -> None:
+    def subscribe(self, node_name: str, queue: DroppableQueue) -> None:
         """Subscribe to logs for a specific node."""
         self._subscribers[node_name].add(queue)
         # Update reverse lookup
         self._full_name_queues[node_name].add(queue)
         short = node_name.rsplit("/", 1)[-1] if "/" in node_name else node_name
         self._short_name_queues[short].add(queue)
+        self._rebuild_name_snapshots(node_name, short)
 
-    def unsubscribe(self, node_name: str, queue: asyncio.Queue) -> None:
+    def unsubscribe(self, node_name: str, queue: DroppableQueue) -> None:
         """Unsubscribe from node-specific logs."""
         self._subscribers[node_name].discard(queue)
         if not self._subscribers[node_name]:
@@ -115,14 +123,28 @@ class LogCollector:
         self._short_name_queues[short].discard(queue)
         if not self._short_name_queues[short]:
             del self._short_name_queues[short]
+        self._rebuild_name_snapshots(node_name, short)
 
-    def subscribe_all(self, queue: asyncio.Queue) -> None:
+    def subscribe_all(self, queue: DroppableQueue) -> None:
         """Subscribe to all logs."""
         self._all_subscribers.add(queue)
+        self._all_subs_snapshot = tuple(self._all_subscribers)
 
-    def unsubscribe_all(self, queue: asyncio.Queue) -> None:
+    def unsubscribe_all(self, queue: DroppableQueue) -> None:
         """Unsubscribe from all logs."""
         self._all_subscribers.discard(queue)
+        self._all_subs_snapshot = tuple(self._all_subscribers)
+
+    def _rebuild_name_snapshots(self, full_name: str, short_name: str) -> None:
+        """Refresh the dispatch snapshots for the two affected name keys."""
+        for key, queues, snap in (
+            (full_name, self._full_name_queues, self._full_name_snapshot),
+            (short_name, self._short_name_queues, self._short_name_snapshot),
+        ):
+            if queues.get(key):
+                snap[key] = tuple(queues[key])
+            else:
+                snap.pop(key, None)
 
     # ─────────────────────────────────────────────────────────────────
     # Callback subscriptions (for services: HistoryStore, AlertService)
@@ -185,12 +207,14 @@ class LogCollector:
                     if msg:
                         msg_count += 1
                         if msg_count <= 3:
-                            logger.debug(f"[logs] Message #{msg_count}: [{msg.level}] {msg.node_name}: {msg.message[:80]}")
+                            # %-style so slicing/formatting only happens at DEBUG
+                            logger.debug("[logs] Message #%d: [%s] %s: %.80s",
+                                         msg_count, msg.level, msg.node_name, msg.message)
                         elif msg_count == 4:
                             logger.debug("[logs] Stream working, suppressing further debug output")
                         self._dispatch(msg)
 
-                logger.info(f"/rosout JSON stream ended after {msg_count} messages, retrying in 5s...")
+                logger.info("/rosout JSON stream ended after %d messages, retrying in 5s...", msg_count)
 
             except ConnectionError as e:
                 logger.warning(f"Connection error: {e}")
@@ -218,8 +242,8 @@ class LogCollector:
                 nanosec = int((ts - sec) * 1e9) if isinstance(ts, float) else 0
             timestamp = datetime.fromtimestamp(sec + nanosec / 1e9)
 
-            level_int = data.get('level', 20)
-            level = self._level_map.get(level_int, "INFO")
+            level_idx = data.get('level', 20) // 10
+            level = _LEVEL_NAMES[level_idx] if 1 <= level_idx <= 5 else "INFO"
             node_name = data.get('node', '')
             # ROS2 logger names use dots (e.g. "sensing.lidar.front.convert_filter")
             # but node names from graph API use slashes ("/sensing/lidar/front/convert_filter").
@@ -256,26 +280,24 @@ class LogCollector:
             except Exception as e:
                 logger.error(f"Log callback error: {e}")
 
-        # 2. All-subscribers (WebSocket /ws/logs/all)
-        #    DroppableQueue.put_nowait tracks drops; plain Queue drops silently.
-        for queue in self._all_subscribers:
-            try:
-                queue.put_nowait(msg)
-            except asyncio.QueueFull:
-                pass  # drop: client is slow
-
-        # 3. Node-specific subscribers — O(1) lookup
-        if self._full_name_queues or self._short_name_queues:
-            target_queues = set()
-            # Match by full name
-            target_queues.update(self._full_name_queues.get(msg.node_name, ()))
-            # Match by short name
+        # 2. All-subscribers (WebSocket /ws/logs/all).
+        #    DroppableQueue.put_nowait never raises — slow clients just
+        #    accumulate a drop counter, so no per-queue exception handling.
+        for queue in self._all_subs_snapshot:
+            queue.put_nowait(msg)
+
+        # 3. Node-specific subscribers — O(1) snapshot lookup
+        if self._full_name_snapshot or self._short_name_snapshot:
+            full = self._full_name_snapshot.get(msg.node_name)
             short_name = msg.node_name.rsplit("/", 1)[-1] if "/" in msg.node_name else msg.node_name
-            target_queues.update(self._short_name_queues.get(short_name, ()))
+            short = self._short_name_snapshot.get(short_name)
 
-            for queue in target_queues:
-                try:
+            if full and short:
+                # A queue subscribed by full name also sits under its short
+                # name — dedupe only when both keys actually matched.
+                for queue in {*full, *short}:
+                    queue.put_nowait(msg)
+            elif full or short:
+                for queue in full or short:
                     queue.put_nowait(msg)
-                except asyncio.QueueFull:
-                    pass
 
@@ -2,8 +2,10 @@
 
 import asyncio
 import logging
+import re
 import time
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -24,13 +26,14 @@ IGNORED_NODE_PATTERNS = [
     'launch_ros_',
 ]
 
+# One C-level scan instead of a Python loop of substring checks; results
+# are memoized — node names are stable strings checked twice per refresh
+_IGNORED_RE = re.compile("|".join(re.escape(p) for p in IGNORED_NODE_PATTERNS))
+
+@lru_cache(maxsize=4096)
 def is_technical_node(node_name: str) -> bool:
     """Check if node is a technical/temporary node that should be hidden."""
-    name_lower = node_name.lower()
-    for pattern in IGNORED_NODE_PATTERNS:
-        if pattern in name_lower:
-            return True
-    return False
+    return _IGNORED_RE.search(node_name.lower()) is not None
 
 class NodeService:
     """Service for managing ROS2 nodes."""
@@ -41,11 +44,16 @@ class NodeService:
     def __init__(self, connection: AgentConnection, persister: StatePersister):
         self.conn = connection
         self.persister = persister
-        self._type_check_tasks: dict[str, asyncio.Task] = {}
+        # Background lifecycle-state batch tasks: strongly referenced so
+        # they can't be garbage-collected mid-run, cancelled in stop()
+        self._lifecycle_tasks: set[asyncio.Task] = set()
         # Rate-limiting & backoff
         self._last_refresh: float = 0
         self._refresh_interval: float = self._BASE_INTERVAL
         self._consecutive_failures: int = 0
+        # Memoized NodesResponse, valid while the persister version matches
+        self._cached_response: Optional[NodesResponse] = None
+        self._cached_response_version: int = -1
 
     async def refresh_nodes(self) -> NodesResponse:
         """
@@ -96,13 +104,15 @@ class NodeService:
                 self.persister.set_node_status(node_name, NodeStatus.INACTIVE)
 
         # Check types for new nodes concurrently (max 20 parallel)
+        lifecycle_new: list[str] = []
+
         async def _check_type(node_name: str):
             try:
                 is_lifecycle = await self.conn.is_lifecycle_node(node_name)
                 node_type = NodeType.LIFECYCLE if is_lifecycle else NodeType.REGULAR
                 self.persister.set_node_type(node_name, node_type)
                 if is_lifecycle:
-                    self._schedule_lifecycle_state_check(node_name)
+                    lifecycle_new.append(node_name)
             except Exception as e:
                 logger.error(f"Error checking type for {node_name}: {e}")
 
@@ -112,33 +122,52 @@ class NodeService:
                 async with sem:
                     await _check_type(n)
             await asyncio.gather(*[_bounded(n) for n in new_nodes], return_exceptions=True)
+            # Lifecycle states for the whole batch in one background task
+            if lifecycle_new:
+                task = asyncio.create_task(
+                    self._gather_lifecycle_states(lifecycle_new)
+                )
+                self._lifecycle_tasks.add(task)
+                task.add_done_callback(self._lifecycle_tasks.discard)
 
         # Save state
-        self.persister.save()
+        self.persister.save_soon()
 
         # Build response
         return self._build_nodes_response()
 
-    def _schedule_lifecycle_state_check(self, node_name: str) -> None:
-        """Schedule background task to get lifecycle state."""
-        if node_name in self._type_check_tasks:
-            return  # already in progress
-        task = asyncio.create_task(self._get_lifecycle_state(node_name))
-        self._type_check_tasks[node_name] = task
-        task.add_done_callback(lambda t, n=node_name: self._type_check_tasks.pop(n, None))
+    async def _gather_lifecycle_states(self, node_names: list[str]) -> None:
+        """Fetch lifecycle states for a batch of new nodes.
 
-    async def _get_lifecycle_state(self, node_name: str) -> None:
-        """Get lifecycle state for a node."""
-        try:
-            state = await self.conn.ros2_lifecycle_get_state(node_name)
+        Bounded gather (4 parallel) so a big launch doesn't flood the
+        agent; one debounced save at the end instead of one per node.
+        """
+        sem = asyncio.Semaphore(4)
+
+        async def _one(node_name: str) -> None:
+            async with sem:
+                try:
+                    state = await self.conn.ros2_lifecycle_get_state(node_name)
+                except Exception as e:
+                    logger.error(f"Error getting lifecycle state for {node_name}: {e}")
+                    return
             if state:
                 node = self.persister.get_node(node_name)
                 if node:
                     node.lifecycle_state = LifecycleState(state)
                     self.persister.update_node(node)
-                    self.persister.save()
-        except Exception as e:
-            logger.error(f"Error getting lifecycle state for {node_name}: {e}")
+
+        await asyncio.gather(*[_one(n) for n in node_names])
+        self.persister.save_soon()
+
+    async def stop(self) -> None:
+        """Cancel pending background lifecycle-state tasks."""
+        tasks = list(self._lifecycle_tasks)
+        self._lifecycle_tasks.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
     
     async def get_node_detail(self, node_name: str, refresh: bool = True) -> Optional[NodeDetailResponse]:
         """Get detailed information about a node."""
@@ -181,7 +210,7 @@ class NodeService:
 
                 # Save
                 self.persister.update_node(node)
-                self.persister.save()
+                self.persister.save_soon()
 
             except Exception as e:
                 logger.error(f"Error fetching node detail: {e}")
@@ -202,7 +231,7 @@ class NodeService:
             if params:
                 node.parameters = params
                 self.persister.update_node(node)
-                self.persister.save()
+                self.persister.save_soon()
             return params or {}
         except Exception as e:
             logger.error(f"Error fetching params for {node_name}: {e}")
@@ -231,7 +260,7 @@ class NodeService:
                 success = await self.conn.ros2_lifecycle_set(node_name, "shutdown")
                 if success:
                     self.persister.set_node_status(node_name, NodeStatus.INACTIVE)
-                    self.persister.save()
+                    self.persister.save_soon()
                     return True, "Lifecycle node shutdown successfully"
                 else:
                     return False, "Failed to shutdown lifecycle node"
@@ -247,7 +276,7 @@ class NodeService:
                 
                 if success:
                     self.persister.set_node_status(node_name, NodeStatus.INACTIVE)
-                    self.persister.save()
+                    self.persister.save_soon()
                     return True, "Process killed (node may restart if managed by launch)"
                 else:
                     return False, f"Could not find process matching '{pattern}'"
@@ -277,7 +306,7 @@ class NodeService:
                 if state:
                     node.lifecycle_state = LifecycleState(state)
                     self.persister.update_node(node)
-                    self.persister.save()
+                    self.persister.save_soon()
             
             return success, message
             
@@ -289,34 +318,48 @@ class NodeService:
         return self._build_nodes_response()
     
     def _build_nodes_response(self) -> NodesResponse:
-        """Build NodesResponse from current state."""
+        """Build NodesResponse from current state.
+
+        Memoized against the persister's mutation counter: between state
+        changes (the common case under 5s WS polling) the same response
+        object is returned without re-constructing N summaries.
+        """
+        version = self.persister.version
+        if self._cached_response is not None and version == self._cached_response_version:
+            return self._cached_response
+
         all_nodes = self.persister.get_all_nodes()
-        
-        # Filter out technical nodes
-        filtered_nodes = {
-            name: node for name, node in all_nodes.items() 
-            if not is_technical_node(name)
-        }
-        
-        total = len(filtered_nodes)
-        active = sum(1 for n in filtered_nodes.values() if n.status == NodeStatus.ACTIVE)
-        inactive = total - active
-        
+
+        # Single pass: filter technical nodes, count active and build
+        # summaries together (no intermediate dict, no second scan).
+        # model_construct skips field validation — values come straight from
+        # already-validated NodeInfo models, and this runs every poll tick.
         nodes = []
-        for name, node in filtered_nodes.items():
-            nodes.append(NodeSummary(
+        active = 0
+        for name, node in all_nodes.items():
+            if is_technical_node(name):
+                continue
+            if node.status == NodeStatus.ACTIVE:
+                active += 1
+            nodes.append(NodeSummary.model_construct(
                 name=name,
                 type=node.type,
                 status=node.status,
                 lifecycle_state=node.lifecycle_state
             ))
-        
+
+        total = len(nodes)
+        inactive = total - active
+
         # Sort by name
         nodes.sort(key=lambda n: n.name)
-        
-        return NodesResponse(
+
+        response = NodesResponse.model_construct(
             total=total,
             active=active,
             inactive=inactive,
             nodes=nodes
         )
+        self._cached_response = response
+        self._cached_response_version = version
+        return response
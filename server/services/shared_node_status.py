@@ -23,9 +23,18 @@ class SharedNodeStatusBroadcaster:
         # These are set externally before start()
         self._node_service = None
         self._disconnect_callback = None  # async callable for auto-disconnect
+        self.alert_service = None  # set by main.py — drives node up/down alerts
+        # Last broadcast state: full snapshot for new subscribers,
+        # status map for computing deltas between ticks.
+        self._last_status: dict[str, str] = {}
+        self._last_snapshot: dict = None
 
     def subscribe(self, queue: DroppableQueue) -> None:
         self._subscribers.add(queue)
+        # New client gets the current full snapshot immediately; subsequent
+        # ticks only carry deltas.
+        if self._last_snapshot is not None:
+            queue.put_nowait(self._last_snapshot)
 
     def unsubscribe(self, queue: DroppableQueue) -> None:
         self._subscribers.discard(queue)
@@ -65,12 +74,24 @@ class SharedNodeStatusBroadcaster:
                     try:
                         response = await self._node_service.refresh_nodes()
 
-                        nodes_status = {
-                            n.name: n.status.value
-                            for n in response.nodes
-                        }
-
-                        message = {
+                        # Single C-level dict copy of the persister's SoA
+                        # status map instead of an O(N) attribute-fetch loop.
+                        nodes_status = dict(
+                            self._node_service.persister.get_status_map()
+                        )
+
+                        # Same poll also drives node up/down alerts —
+                        # AlertService no longer runs its own 5 s timer
+                        if self.alert_service:
+                            self.alert_service.apply_node_snapshot({
+                                name for name, status in nodes_status.items()
+                                if status == "active"
+                            })
+
+                        # Full snapshot is kept for newly connecting clients;
+                        # existing clients only get what changed (O(delta)
+                        # bytes per tick instead of O(nodes)).
+                        snapshot = {
                             "type": "nodes_update",
                             "total": response.total,
                             "active": response.active,
@@ -78,7 +99,30 @@ class SharedNodeStatusBroadcaster:
                             "nodes": nodes_status,
                             "timestamp": datetime.now().isoformat()
                         }
-                        self._broadcast(message)
+
+                        if self._last_snapshot is None:
+                            self._broadcast(snapshot)
+                        else:
+                            last = self._last_status
+                            changed = {
+                                name: status
+                                for name, status in nodes_status.items()
+                                if last.get(name) != status
+                            }
+                            removed = [name for name in last if name not in nodes_status]
+                            if changed or removed:
+                                self._broadcast({
+                                    "type": "nodes_delta",
+                                    "total": response.total,
+                                    "active": response.active,
+                                    "inactive": response.inactive,
+                                    "changed": changed,
+                                    "removed": removed,
+                                    "timestamp": snapshot["timestamp"],
+                                })
+
+                        self._last_status = nodes_status
+                        self._last_snapshot = snapshot
 
                     except (ContainerNotFoundError, ConnError) as e:
                         logger.warning(f"Connection lost, auto-disconnecting: {e}")
@@ -1,42 +1,124 @@
 """State persistence for nodes."""
 
-import json
+import asyncio
 import logging
 import os
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
+import orjson
+
 from ..models import NodeInfo, NodeState, NodeType, NodeStatus
 from ..config import settings
 
 # Inactive nodes older than this are pruned on save
 _INACTIVE_TTL = timedelta(hours=24)
 
+# Mutation bursts within this window coalesce into a single disk write
+_SAVE_DEBOUNCE = 0.2
+
+# Force an early flush if this many mutations pile up before the timer
+# fires (keeps the crash-loss window bounded during large node churn)
+_MAX_PENDING_OPS = 64
+
 logger = logging.getLogger(__name__)
 
 
+def _namespace_of(name: str) -> str:
+    """Namespace a node name lives in ('/ns/node' -> '/ns', '/node' -> '/')."""
+    return name.rsplit('/', 1)[0] or '/'
+
+
+def _node_dict(node: NodeInfo) -> dict:
+    """Serializable dict for a node via plain attribute access.
+
+    model_dump() walks the field set and runs serializers per call; this
+    explicit literal is far cheaper on a save loop over many nodes, and
+    orjson handles the datetime/enum values natively anyway.
+    """
+    return {
+        "name": node.name,
+        "first_seen": node.first_seen,
+        "last_seen": node.last_seen,
+        "type": node.type,
+        "status": node.status,
+        "lifecycle_state": node.lifecycle_state,
+        "parameters": node.parameters,
+        "subscribers": node.subscribers,
+        "publishers": node.publishers,
+        "services": node.services,
+    }
+
+
 class StatePersister:
     """Manages persistence of node state to JSON file."""
     
     def __init__(self, server_id: str):
         self.server_id = server_id
         self.file_path = settings.data_dir / f"node_state_{server_id}.json"
+        # Write-ahead log: one JSON line per mutation, replayed over the
+        # snapshot on load and truncated whenever a snapshot is written.
+        # Makes each mutation durable with one O(1) append instead of
+        # waiting for the next full-file rewrite.
+        self._wal_path = settings.data_dir / f"node_state_{server_id}.wal"
+        self._wal_fd: Optional[int] = None
+        # WAL byte accounting: total bytes ever appended vs. bytes covered
+        # by the latest snapshot. Snapshot completion trims exactly the
+        # covered prefix, so records appended while a write was in flight
+        # survive until their own snapshot lands.
+        self._wal_written: int = 0
+        self._wal_covered: int = 0
         self._state: Optional[NodeState] = None
+        # Parallel name -> status.value map (SoA layout): lets broadcasters
+        # copy statuses with one dict() call instead of iterating NodeInfo.
+        self._status_by_name: dict[str, str] = {}
+        # Bumped on every mutation; lets callers memoize derived views.
+        self._version: int = 0
+        # SoA status index: status -> node names. get_counts() is a pair
+        # of len() calls and it scales to any future NodeStatus member.
+        self._status_index: dict[NodeStatus, set[str]] = defaultdict(set)
+        # namespace -> node names living directly in it, so namespace
+        # lookups touch O(matches) nodes instead of scanning the full dict.
+        self._by_ns: dict[str, set[str]] = defaultdict(set)
+        # last_updated as an epoch float — mutators touch it on every
+        # call, and time.time() skips the datetime allocation; a real
+        # datetime is materialized once per snapshot in _serialize().
+        self._last_updated_ts: float = time.time()
+        # Pending debounced save (see save_soon)
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        # Mutations recorded since the last disk write
+        self._pending_ops: int = 0
+        # In-flight off-loop snapshot write (see _run_scheduled_save)
+        self._io_task: Optional[asyncio.Task] = None
+        # Serializes concurrent writers (off-loop task vs. sync flush)
+        self._write_lock = threading.Lock()
+        # Version of the snapshot currently on disk — a write carrying an
+        # older version is skipped, so a slow in-flight write can never
+        # clobber a newer flush (guarded by _write_lock).
+        self._written_version: int = -1
+        # Eager load: every public method can assume _state is populated,
+        # no lazy-load branch on the hot paths.
+        self.load()
     
     def load(self) -> NodeState:
         """Load state from file or create new."""
         if self.file_path.exists():
             try:
-                with open(self.file_path) as f:
-                    data = json.load(f)
+                data = orjson.loads(self.file_path.read_bytes())
                 
-                # Convert nodes dict
+                # Convert nodes dict. Parse timestamps with the C-level
+                # fromisoformat (bound locally — skips the attribute lookup
+                # per node) so Pydantic receives real datetime objects and
+                # takes its fast isinstance path instead of re-parsing.
+                _fromiso = datetime.fromisoformat
                 nodes = {}
                 for name, node_data in data.get("nodes", {}).items():
-                    # Convert datetime strings
-                    node_data["first_seen"] = datetime.fromisoformat(node_data["first_seen"])
-                    node_data["last_seen"] = datetime.fromisoformat(node_data["last_seen"])
+                    node_data["first_seen"] = _fromiso(node_data["first_seen"])
+                    node_data["last_seen"] = _fromiso(node_data["last_seen"])
                     nodes[name] = NodeInfo(**node_data)
                 
                 self._state = NodeState(
@@ -49,83 +131,287 @@ class StatePersister:
                 self._state = self._create_empty_state()
         else:
             self._state = self._create_empty_state()
-        
+
+        # Apply mutations recorded after the snapshot was last written
+        self._replay_wal()
+        self._wal_written = (
+            self._wal_path.stat().st_size if self._wal_path.exists() else 0
+        )
+        self._wal_covered = 0
+
+        self._last_updated_ts = self._state.last_updated.timestamp()
+
+        self._status_by_name = {
+            name: node.status.value for name, node in self._state.nodes.items()
+        }
+        self._by_ns = defaultdict(set)
+        self._status_index = defaultdict(set)
+        for name, node in self._state.nodes.items():
+            self._by_ns[_namespace_of(name)].add(name)
+            self._status_index[node.status].add(name)
+        self._version += 1
         return self._state
     
     def save(self) -> None:
-        """Save state to file. Prunes stale inactive nodes before writing."""
+        """Write state to disk now. Prunes stale inactive nodes first.
+
+        Most callers should prefer save_soon(); this is the synchronous
+        flush used by the debounce machinery and at shutdown.
+        """
+        payload, version, wal_mark = self._serialize()
+        if payload is not None:
+            self._write_snapshot(payload, version)
+            self._trim_wal(wal_mark)
+
+    def _serialize(self) -> tuple[Optional[bytes], int, int]:
+        """Prune and encode the current state to one bytes payload.
+
+        Runs on the event loop so it always sees a consistent state;
+        orjson emits datetime (and str-enum) values natively, so the
+        node dicts go straight in — no per-field isoformat pass.
+
+        Returns (payload, version, wal_mark): the mutation version the
+        payload represents and the WAL byte offset it covers.
+        """
         if not self._state:
-            return
+            return None, 0, 0
 
         # Remove inactive nodes not seen for >24h
         self.prune_inactive()
 
         # Ensure directory exists
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Convert to JSON-serializable format
+
+        self._state.last_updated = datetime.fromtimestamp(self._last_updated_ts)
         data = {
-            "last_updated": self._state.last_updated.isoformat(),
+            "last_updated": self._state.last_updated,
             "server_id": self._state.server_id,
-            "nodes": {}
+            "nodes": {
+                name: _node_dict(node)
+                for name, node in self._state.nodes.items()
+            },
         }
-        
-        for name, node in self._state.nodes.items():
-            node_dict = node.model_dump()
-            node_dict["first_seen"] = node.first_seen.isoformat()
-            node_dict["last_seen"] = node.last_seen.isoformat()
-            data["nodes"][name] = node_dict
-        
-        # Atomic write: write to temp file, then rename
-        tmp_path = self.file_path.with_suffix('.tmp')
-        with open(tmp_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
-        os.replace(tmp_path, self.file_path)
+        self._pending_ops = 0
+        return (
+            orjson.dumps(data, option=orjson.OPT_INDENT_2),
+            self._version,
+            self._wal_written,
+        )
+
+    def _write_snapshot(self, payload: bytes, version: int) -> None:
+        """Blocking disk IO half of save() — safe to run off-loop.
+
+        Atomic write: one write() syscall for the whole payload, fsync so
+        the rename never publishes a partially-flushed file, then
+        os.replace. The lock serializes an off-loop write racing a sync
+        flush() at shutdown, and the version check drops a write whose
+        payload is older than what is already on disk (a slow threaded
+        write finishing after a shutdown flush must not win).
+        """
+        with self._write_lock:
+            if version <= self._written_version:
+                return  # a newer snapshot already landed
+            tmp_path = self.file_path.with_suffix('.tmp')
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, payload)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, self.file_path)
+            self._written_version = version
     
+    def _wal_append(self, record: dict) -> None:
+        """Append one mutation record to the WAL (single O_APPEND write)."""
+        try:
+            if self._wal_fd is None:
+                self._wal_fd = os.open(
+                    self._wal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+                )
+            line = orjson.dumps(record) + b"\n"
+            os.write(self._wal_fd, line)
+            self._wal_written += len(line)
+        except OSError as e:
+            logger.warning(f"WAL append failed: {e}")
+
+    def _trim_wal(self, mark: int) -> None:
+        """Drop the WAL prefix covered by a completed snapshot.
+
+        Must run on the event loop (or a sync context) — never from the
+        write worker thread — so it cannot race _wal_append: records
+        appended while the snapshot was in flight sit past *mark* and are
+        preserved. Idempotent: a mark at or below what is already covered
+        is a no-op, so a late trim from a superseded write changes
+        nothing.
+        """
+        if mark <= self._wal_covered:
+            return
+        drop = mark - self._wal_covered
+        try:
+            tail = b""
+            if self._wal_path.exists():
+                tail = self._wal_path.read_bytes()[drop:]
+            if self._wal_fd is not None:
+                os.ftruncate(self._wal_fd, 0)
+                if tail:
+                    os.write(self._wal_fd, tail)
+            elif self._wal_path.exists():
+                if tail:
+                    self._wal_path.write_bytes(tail)
+                else:
+                    self._wal_path.unlink()
+            self._wal_covered = mark
+        except OSError as e:
+            logger.warning(f"WAL trim failed: {e}")
+
+    def _replay_wal(self) -> None:
+        """Replay mutations logged after the last snapshot (crash recovery)."""
+        if not self._wal_path.exists():
+            return
+        count = 0
+        for line in self._wal_path.read_bytes().splitlines():
+            if not line:
+                continue
+            try:
+                rec = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue  # torn tail from a crash mid-append
+            op = rec.get("op")
+            if op == "upsert":
+                nd = rec["node"]
+                nd["first_seen"] = datetime.fromisoformat(nd["first_seen"])
+                nd["last_seen"] = datetime.fromisoformat(nd["last_seen"])
+                self._state.nodes[nd["name"]] = NodeInfo(**nd)
+            elif op == "status":
+                node = self._state.nodes.get(rec["name"])
+                if node:
+                    node.status = NodeStatus(rec["status"])
+                    node.last_seen = datetime.fromisoformat(rec["last_seen"])
+            elif op == "type":
+                node = self._state.nodes.get(rec["name"])
+                if node:
+                    node.type = NodeType(rec["type"])
+            count += 1
+        if count:
+            logger.info(f"Replayed {count} WAL records over snapshot")
+
+    def save_soon(self) -> None:
+        """Schedule a debounced save.
+
+        Bursts of mutations (N lifecycle callbacks, a refresh cycle)
+        coalesce into one serialization + write instead of one per call.
+        If a burst exceeds _MAX_PENDING_OPS before the timer fires, the
+        write happens immediately so a crash loses at most that many ops.
+        """
+        self._pending_ops += 1
+        if self._save_handle is not None:
+            if self._pending_ops >= _MAX_PENDING_OPS:
+                self._save_handle.cancel()
+                self._save_handle = None
+                self.save()
+            return  # already scheduled
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save()  # no loop (sync context) — write immediately
+            return
+        self._save_handle = loop.call_later(_SAVE_DEBOUNCE, self._run_scheduled_save)
+
+    def _run_scheduled_save(self) -> None:
+        self._save_handle = None
+        if self._io_task is not None and not self._io_task.done():
+            # Previous write still in flight — retry after another window
+            loop = asyncio.get_running_loop()
+            self._save_handle = loop.call_later(
+                _SAVE_DEBOUNCE, self._run_scheduled_save
+            )
+            return
+        self._io_task = asyncio.create_task(self._save_off_loop())
+
+    async def _save_off_loop(self) -> None:
+        """Serialize on the loop, then push the disk IO to a worker thread
+        so fsync latency never stalls request handling. The WAL trim runs
+        back on the loop once the write has landed."""
+        payload, version, wal_mark = self._serialize()
+        if payload is not None:
+            await asyncio.to_thread(self._write_snapshot, payload, version)
+            self._trim_wal(wal_mark)
+
+    def flush(self) -> None:
+        """Write any pending debounced save immediately.
+
+        Safe against an in-flight off-loop write: this snapshot carries a
+        version at least as new, so _write_snapshot discards the slower
+        threaded write when it eventually acquires the lock.
+        """
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+            self.save()
+
     def get_state(self) -> NodeState:
         """Get current state."""
-        if not self._state:
-            self.load()
         return self._state
     
     def update_node(self, node: NodeInfo) -> None:
         """Update or add a node."""
-        if not self._state:
-            self.load()
-        
+        existing = self._state.nodes.get(node.name)
+        if existing is not None and existing is not node and existing == node:
+            # Distinct-but-equal copy: nothing changed, keep the version
+            # (and the memoized responses keyed on it) intact. The
+            # identity check matters — callers often mutate the stored
+            # instance in place, where equality proves nothing.
+            return
+        old_status = self._status_by_name.get(node.name)
+        if old_status is not None and old_status != node.status.value:
+            self._status_index[NodeStatus(old_status)].discard(node.name)
+        self._status_index[node.status].add(node.name)
         self._state.nodes[node.name] = node
-        self._state.last_updated = datetime.now()
+        self._status_by_name[node.name] = node.status.value
+        self._by_ns[_namespace_of(node.name)].add(node.name)
+        self._version += 1
+        self._last_updated_ts = time.time()
+        self._wal_append({"op": "upsert", "node": _node_dict(node)})
     
     def get_node(self, name: str) -> Optional[NodeInfo]:
         """Get node by name."""
-        if not self._state:
-            self.load()
         return self._state.nodes.get(name)
     
     def set_node_status(self, name: str, status: NodeStatus) -> None:
         """Update node status."""
-        if not self._state:
-            self.load()
-        
         if name in self._state.nodes:
+            old_status = self._status_by_name.get(name)
+            if old_status == status.value:
+                # Heartbeat case (refresh re-asserting the same status
+                # every tick): refresh last_seen in memory but skip the
+                # version bump and WAL append — the next real mutation's
+                # snapshot persists it.
+                self._state.nodes[name].last_seen = datetime.now()
+                return
+            if old_status is not None:
+                self._status_index[NodeStatus(old_status)].discard(name)
+            self._status_index[status].add(name)
+            now = datetime.now()
             self._state.nodes[name].status = status
-            self._state.nodes[name].last_seen = datetime.now()
-            self._state.last_updated = datetime.now()
+            self._state.nodes[name].last_seen = now
+            self._status_by_name[name] = status.value
+            self._version += 1
+            self._last_updated_ts = now.timestamp()
+            self._wal_append({"op": "status", "name": name,
+                              "status": status, "last_seen": now})
     
     def set_node_type(self, name: str, node_type: NodeType) -> None:
         """Update node type."""
-        if not self._state:
-            self.load()
-        
         if name in self._state.nodes:
+            if self._state.nodes[name].type == node_type:
+                return
             self._state.nodes[name].type = node_type
-            self._state.last_updated = datetime.now()
+            self._version += 1
+            self._last_updated_ts = time.time()
+            self._wal_append({"op": "type", "name": name, "type": node_type})
     
     def add_new_node(self, name: str) -> NodeInfo:
         """Add a new node with unknown type."""
-        if not self._state:
-            self.load()
-        
         now = datetime.now()
         node = NodeInfo(
             name=name,
@@ -135,24 +421,47 @@ class StatePersister:
             status=NodeStatus.ACTIVE
         )
         self._state.nodes[name] = node
-        self._state.last_updated = now
+        self._status_by_name[name] = node.status.value
+        self._by_ns[_namespace_of(name)].add(name)
+        self._status_index[NodeStatus.ACTIVE].add(name)  # new nodes start ACTIVE
+        self._version += 1
+        self._last_updated_ts = now.timestamp()
+        self._wal_append({"op": "upsert", "node": _node_dict(node)})
         return node
     
     def get_all_nodes(self) -> dict[str, NodeInfo]:
         """Get all nodes."""
-        if not self._state:
-            self.load()
         return self._state.nodes
     
+    @property
+    def version(self) -> int:
+        """Monotonic mutation counter (cache invalidation key)."""
+        return self._version
+
+    def get_status_map(self) -> dict[str, str]:
+        """Get name -> status.value map (do not mutate)."""
+        return self._status_by_name
+
+    def get_nodes_in_namespace(self, namespace: str) -> list[NodeInfo]:
+        """Get nodes whose name starts with namespace, via the ns index."""
+        nodes = self._state.nodes
+        result = []
+        for ns, names in self._by_ns.items():
+            if ns.startswith(namespace):
+                # Whole namespace (and its children) matches the prefix
+                result.extend(nodes[n] for n in names)
+            elif namespace.startswith(ns):
+                # Prefix reaches into this namespace: check individual names
+                result.extend(nodes[n] for n in names if n.startswith(namespace))
+        return result
+
     def get_counts(self) -> tuple[int, int, int]:
         """Get (total, active, inactive) counts."""
-        if not self._state:
-            self.load()
-        
+        # Index lengths — no per-call scan
         total = len(self._state.nodes)
-        active = sum(1 for n in self._state.nodes.values() if n.status == NodeStatus.ACTIVE)
+        active = len(self._status_index[NodeStatus.ACTIVE])
         inactive = total - active
-        
+
         return total, active, inactive
     
     def prune_inactive(self) -> int:
@@ -167,9 +476,12 @@ class StatePersister:
             and (now - node.last_seen) > _INACTIVE_TTL
         ]
         for name in to_remove:
-            del self._state.nodes[name]
-
+            node = self._state.nodes.pop(name)
+            self._status_by_name.pop(name, None)
+            self._by_ns[_namespace_of(name)].discard(name)
+            self._status_index[node.status].discard(name)
         if to_remove:
+            self._version += 1
             logger.info(f"Pruned {len(to_remove)} inactive nodes (not seen for >{_INACTIVE_TTL})")
         return len(to_remove)
 
@@ -48,11 +48,25 @@ export function useNodes({ onDisconnect } = {}) {
             inactive: data.inactive,
           });
 
-          // Update node statuses
+          // Update node statuses (full snapshot, sent on connect)
           setNodes(prev => prev.map(node => ({
             ...node,
             status: data.nodes[node.name] || node.status
           })));
+        } else if (data.type === 'nodes_delta') {
+          setCounts({
+            total: data.total,
+            active: data.active,
+            inactive: data.inactive,
+          });
+
+          // Apply delta: only changed/removed nodes are in the message
+          setNodes(prev => prev
+            .filter(node => !data.removed.includes(node.name))
+            .map(node => data.changed[node.name]
+              ? { ...node, status: data.changed[node.name] }
+              : node
+            ));
         } else if (data.type === 'container_stopped' || data.type === 'disconnected') {
           // Container stopped or server disconnected
           console.log('Server disconnected:', data.message);